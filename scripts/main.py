@@ -1,27 +1,137 @@
 import argparse
+import atexit
 import os
+import queue
 import sys
+import itertools
 import json
+import multiprocessing
+import shutil
+import signal
 import subprocess
+import tempfile
 import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 import logging
+from logging.handlers import QueueHandler, QueueListener
 import socket
-from typing import Dict, List
+import threading
+import time
+from typing import Dict, Iterator, List
 import csv
 
+try:
+    import dns.exception
+    import dns.resolver
+except ImportError:
+    dns = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Log records are handed to a background listener thread so the probe
+# workers never block on writing to stdout
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.StreamHandler(sys.stdout)
+        QueueHandler(log_queue)
     ]
 )
 logger = logging.getLogger(__name__)
 
+# Resolved once at import instead of spawning `which`/`where` on every run
+AMASS_PATH = shutil.which('amass')
+
+# Common subdomains, tested as the fallback when amass is unavailable and as
+# the warm-up batch while amass runs
+COMMON_SUBDOMAINS = (
+    'www', 'mail', 'ftp', 'admin', 'api', 'app', 'dev', 'test', 'staging',
+    'blog', 'shop', 'store', 'forum', 'support', 'help', 'docs', 'cdn',
+    'static', 'assets', 'images', 'media', 'files', 'download', 'uploads'
+)
+
+# Subdomain lists of at least twice this size are validated across multiple
+# processes, each handling at least this many hosts
+PROCESS_CHUNK_THRESHOLD = 1000
+
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 64
+
+# Process-local DNS cache: {host: (expiry, ip_addresses)}
+DNS_CACHE_TTL = 900
+_dns_cache: Dict[str, tuple] = {}
+_dns_cache_lock = threading.Lock()
+
+DNS_NAMESERVERS = ['1.1.1.1', '8.8.8.8']
+if dns is not None:
+    _resolver = dns.resolver.Resolver(configure=False)
+    _resolver.nameservers = DNS_NAMESERVERS
+    _resolver.timeout = 2
+    _resolver.lifetime = 4
+else:
+    _resolver = None
+
+
+def _resolve(host: str) -> List[str]:
+    """Resolve host to its IP addresses, caching successful lookups for up to DNS_CACHE_TTL seconds"""
+    now = time.monotonic()
+    with _dns_cache_lock:
+        cached = _dns_cache.get(host)
+        if cached and cached[0] > now:
+            return cached[1]
+
+    ip_addresses = None
+    if _resolver is not None:
+        # Query the public resolvers directly and honour the record TTL. Any
+        # failure, NXDOMAIN included, is rechecked with the system resolver:
+        # requests uses it for the HTTP probes, and it also knows /etc/hosts and
+        # internal or split-horizon names the public resolvers cannot see
+        try:
+            answer = _resolver.resolve(host, 'A')
+            ip_addresses = list(dict.fromkeys(record.address for record in answer))
+            ttl = min(answer.rrset.ttl, DNS_CACHE_TTL)
+        except (dns.resolver.NXDOMAIN, dns.exception.Timeout, dns.resolver.NoNameservers, dns.resolver.NoAnswer):
+            pass
+
+    if ip_addresses is None:
+        infos = socket.getaddrinfo(host, None, socket.AF_INET, socket.SOCK_STREAM)
+        ip_addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        ttl = DNS_CACHE_TTL
+
+    with _dns_cache_lock:
+        _dns_cache[host] = (now + ttl, ip_addresses)
+
+    return ip_addresses
+
+def create_session(workers: int) -> requests.Session:
+    """Build the HTTP session used for probing subdomains"""
+    # Shared session so HTTP/HTTPS probes reuse keep-alive connections. The
+    # pool is bounded and blocking so threads wait for a free connection
+    # instead of opening (and later discarding) extra sockets
+    session = requests.Session()
+    session.headers.update({"Connection": "keep-alive"})
+    adapter = HTTPAdapter(
+        pool_connections=max(HTTP_POOL_CONNECTIONS, workers),
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        pool_block=True,
+        max_retries=0
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
 class Reconnaissance:
-    def __init__(self, domain, output_dir, timeout=300, workers=20):
+    def __init__(self, domain, output_dir, timeout=300, workers=20, session=None):
         self.domain = domain
         self.output_dir = output_dir
         self.timeout = timeout
@@ -38,68 +148,107 @@ class Reconnaissance:
             "errors": []
         }
 
+        self.session = session if session is not None else create_session(workers)
+
         os.makedirs(output_dir, exist_ok=True)
 
     def run_amass(self, timeout: int) -> List[str]:
         try:
-            amass_check_cmd = ['where', 'amass'] if os.name == 'nt' else ['which', 'amass']
-            amass_check = subprocess.run(amass_check_cmd, capture_output=True, text=True)
-            if amass_check.returncode != 0:
+            if AMASS_PATH is None:
                 logger.warning("Amass not found, using fallback subdomain enumeration")
-                return self.fallback_subdomain_enumeration()
+                return self._use_fallback_enumeration()
             
             cmd = [
-                'amass', 'enum',
+                AMASS_PATH, 'enum',
                 '-passive',
-                '-d', self.domain,
-                '-o', os.path.join(self.output_dir, f'{self.domain}_amass_results.text')
+                '-d', self.domain
             ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-
-            if result.returncode == 0:
-                results_file = os.path.join(self.output_dir, f'{self.domain}_amass_results.text')
-                if os.path.exists(results_file):
-                    with open(results_file, 'r') as f:
-                        for line in f:
-                            if line.strip():
-                                subdomain = line.strip().split()[0]
+            results_file = os.path.join(self.output_dir, f'{self.domain}_amass_results.text')
+
+            # Stream amass stdout line by line rather than re-reading an output file,
+            # keeping a raw copy of the output alongside the reports
+            timed_out = threading.Event()
+            with tempfile.TemporaryFile(mode='w+') as stderr_file, open(results_file, 'w') as raw_file:
+                # Own session/process group so a kill also reaches any child processes,
+                # which would otherwise keep the stdout pipe open past the timeout
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True, bufsize=1,
+                                        start_new_session=(os.name != 'nt'))
+
+                def kill_amass():
+                    timed_out.set()
+                    self._kill_process_group(proc)
+
+                timer = threading.Timer(timeout, kill_amass)
+                timer.start()
+                try:
+                    seen = set(self.subdomains)
+                    for line in proc.stdout:
+                        raw_file.write(line)
+                        if line.strip():
+                            subdomain = line.strip().split()[0]
+                            if subdomain not in seen:
+                                seen.add(subdomain)
                                 self.subdomains.append(subdomain)
-                    return self.subdomains
-                else:
-                    logger.warning("Amass results file not found, using fallback")
-                    return self.fallback_subdomain_enumeration()
+                    returncode = proc.wait()
+                finally:
+                    timer.cancel()
+                    # Don't leave amass running (or as a zombie) if reading its output failed
+                    if proc.poll() is None:
+                        self._kill_process_group(proc)
+                    proc.stdout.close()
+                    proc.wait()
+
+                stderr_file.seek(0)
+                stderr = stderr_file.read()
+
+            if timed_out.is_set():
+                logger.error(f"Amass timed out after {timeout} seconds")
+                return self._use_fallback_enumeration()
+            elif returncode == 0:
+                return self.subdomains
             else: 
-                logger.error(f"Amass failed with return code: {result.returncode}")
-                logger.error(f"Amass stderr: {result.stderr}")
-                return self.fallback_subdomain_enumeration()
+                logger.error(f"Amass failed with return code: {returncode}")
+                logger.error(f"Amass stderr: {stderr}")
+                return self._use_fallback_enumeration()
         except Exception as e:
             logger.error(f"Error running Amass: {e}")
-            return self.fallback_subdomain_enumeration()
+            return self._use_fallback_enumeration()
+
+    @staticmethod
+    def _kill_process_group(proc: subprocess.Popen):
+        if os.name == 'nt':
+            proc.kill()
+            return
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def _use_fallback_enumeration(self) -> List[str]:
+        logger.info("Using fallback subdomain enumeration method")
+        return self.fallback_subdomain_enumeration()
     
     def fallback_subdomain_enumeration(self) -> List[str]:
         """Fallback method when amass is not available"""
-        logger.info("Using fallback subdomain enumeration method")
-        
-        # Common subdomains to test
-        common_subdomains = [
-            'www', 'mail', 'ftp', 'admin', 'api', 'app', 'dev', 'test', 'staging',
-            'blog', 'shop', 'store', 'forum', 'support', 'help', 'docs', 'cdn',
-            'static', 'assets', 'images', 'media', 'files', 'download', 'uploads'
-        ]
-        
-        fallback_subdomains = []
-        for subdomain in common_subdomains:
-            full_subdomain = f"{subdomain}.{self.domain}"
-            fallback_subdomains.append(full_subdomain)
-        
-        # Also add the main domain
-        fallback_subdomains.append(self.domain)
         
-        return fallback_subdomains
+        # Common subdomains plus the main domain itself
+        return [f"{subdomain}.{self.domain}" for subdomain in COMMON_SUBDOMAINS] + [self.domain]
         
-    def validate_subdomain_http(self, subdomain: str, timeout: int) -> Dict:
-        result = {
+    def _fetch_headers(self, url: str, timeout: int) -> requests.Response:
+        """Fetch status and headers for url without downloading the body"""
+        # Leaving the with blocks releases the connection back to the pool
+        # straight away, without waiting for any body to arrive
+        with self.session.head(url, timeout=timeout, allow_redirects=True, stream=True) as response:
+            if response.status_code not in (405, 501):
+                return response
+
+        # Some servers reject HEAD, fall back to a streamed GET
+        with self.session.get(url, timeout=timeout, allow_redirects=True, stream=True) as response:
+            return response
+
+    @staticmethod
+    def _empty_http_result(subdomain: str) -> Dict:
+        return {
             "subdomain": subdomain,
             "http_status": None,
             "https_status": None,
@@ -109,9 +258,12 @@ class Reconnaissance:
             "technologies": []
         }
 
+    def validate_subdomain_http(self, subdomain: str, timeout: int) -> Dict:
+        result = self._empty_http_result(subdomain)
+
         # HTTP
         try:
-            response = requests.get(f"http://{subdomain}", timeout=timeout, allow_redirects=True)
+            response = self._fetch_headers(f"http://{subdomain}", timeout)
             result["http_status"] = response.status_code
             result["active"] = True
             result["redirects_to"] = response.url
@@ -122,7 +274,7 @@ class Reconnaissance:
 
         # HTTPS
         try:
-            response = requests.get(f"https://{subdomain}", timeout=timeout, allow_redirects=True)
+            response = self._fetch_headers(f"https://{subdomain}", timeout)
             result["https_status"] = response.status_code
             result["active"] = True
             result["redirects_to"] = response.url
@@ -136,55 +288,75 @@ class Reconnaissance:
         result = {
             "subdomain": subdomain,
             "ip_address": None, 
-            "dns_active": False
+            "dns_active": False,
+            "nxdomain": False
         }
 
         try:
-            ip_addresses = socket.gethostbyname_ex(subdomain)[2]
+            ip_addresses = _resolve(subdomain)
             result["ip_addresses"] = ip_addresses
             result["dns_active"] = True
+        except socket.gaierror as e:
+            # Only the system resolver's verdict counts, see _resolve
+            result["nxdomain"] = e.errno == socket.EAI_NONAME
         except Exception:
             pass
 
         return result
     
+    def _probe(self, subdomain: str) -> Dict:
+        """Run the DNS and HTTP checks for one subdomain and merge the results"""
+        dns_result = self.validate_subdomain_dns(subdomain)
+        # The nxdomain flag only drives the short-circuit, it is not a report field
+        if dns_result.pop("nxdomain"):
+            # Host does not exist, HTTP probes would only wait out their timeouts.
+            # Other DNS failures may be transient, so those hosts are still probed
+            http_result = self._empty_http_result(subdomain)
+        else:
+            http_result = self.validate_subdomain_http(subdomain, 10)
+        return {**http_result, **dns_result}
+
     def validate_subdomain(self, subdomains: List[str], max_worker: int) -> List[Dict]:
-        validation_results = []
+        process_count = min(os.cpu_count() or 1, len(subdomains) // PROCESS_CHUNK_THRESHOLD, max_worker)
+        if len(subdomains) <= PROCESS_CHUNK_THRESHOLD or process_count < 2:
+            return self._validate_threaded(subdomains, max_worker)
+
+        # Large batches are split across processes, each running its own
+        # thread pool, session and DNS cache. The workers are divided between
+        # the processes so total concurrency still honours max_worker
+        chunk_size = -(-len(subdomains) // process_count)
+        chunks = [subdomains[i:i + chunk_size] for i in range(0, len(subdomains), chunk_size)]
+        chunk_workers = max(1, max_worker // len(chunks))
+        logger.info(f"Validating {len(subdomains)} subdomains across {len(chunks)} processes")
+
+        # Spawn rather than fork: the parent runs the log listener thread, and a
+        # forked child could inherit its locks mid-write
+        with ProcessPoolExecutor(max_workers=len(chunks), mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker_logging,
+                                 initargs=(logging.getLogger().level,)) as executor:
+            chunk_results = executor.map(
+                _validate_chunk,
+                [self.domain] * len(chunks),
+                [self.output_dir] * len(chunks),
+                chunks,
+                [chunk_workers] * len(chunks)
+            )
+            return list(itertools.chain.from_iterable(chunk_results))
+
+    def _validate_threaded(self, subdomains: List[str], max_worker: int) -> List[Dict]:
+        probe_results = {}
 
         with ThreadPoolExecutor(max_workers=max_worker) as executor:
-            http_futures = {executor.submit(self.validate_subdomain_http, sub, 10): sub 
-                           for sub in subdomains}
-            
-            # Submit DNS validation tasks
-            dns_futures = {executor.submit(self.validate_subdomain_dns, sub): sub 
-                          for sub in subdomains}
-            
-            http_results = {}
-            for future in as_completed(http_futures):
-                subdomain = http_futures[future]
-                try: 
-                    result = future.result()
-                    http_results[subdomain] = result
-                except Exception as e: 
-                    logger.error(f"Error validating HTTP for {subdomain}: {e}")
-
-            dns_results = {}
-            for future in as_completed(dns_futures):
-                subdomain = dns_futures[future]
+            futures = {executor.submit(self._probe, sub): sub for sub in subdomains}
+
+            for future in as_completed(futures):
+                subdomain = futures[future]
                 try:
-                    result = future.result()
-                    dns_results[subdomain] = result
+                    probe_results[subdomain] = future.result()
                 except Exception as e:
-                    logger.error(f"Error validating DNS for {subdomain}: {e}")
-            
-            # Combine results
-            for subdomain in subdomains:
-                result = http_results.get(subdomain, {})
-                dns_result = dns_results.get(subdomain, {})
-                combined_result = {**result, **dns_result}
-                validation_results.append(combined_result)
-            
-            return validation_results
+                    logger.error(f"Error validating {subdomain}: {e}")
+
+        return [probe_results.get(subdomain, {}) for subdomain in subdomains]
         
     def save_json_report(self, filename: str = None) -> str:
         if not filename:
@@ -192,8 +364,12 @@ class Reconnaissance:
         
         filepath = os.path.join(self.output_dir, filename)
         
-        with open(filepath, 'w') as f:
-            json.dump(self.results, f, indent=2, default=str)
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(self.results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(self.results, f, indent=2, default=str)
         
         return filepath
     
@@ -206,24 +382,49 @@ class Reconnaissance:
         if not self.results["subdomains"]:
             return filepath
 
-        fieldnames = list(self.results["subdomains"][0].keys())
+        # Rows can carry different keys (ip_addresses only exists for hosts that
+        # resolved), so the header is the ordered union across all rows
+        fieldnames = list(dict.fromkeys(field for subdomain in self.results["subdomains"] for field in subdomain))
 
-        with open(filepath, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+        def csv_value(subdomain, field):
+            value = subdomain.get(field)
+            if field == "ip_addresses" and isinstance(value, list):
+                return ", ".join(value)
+            return value
 
-            for subdomain in self.results["subdomains"]:
-                row = subdomain.copy()
-                if isinstance(row.get("ip_addresses"), list):
-                    row["ip_addresses"] = ", ".join(row["ip_addresses"])
-                writer.writerow(row)
+        rows = [tuple(csv_value(subdomain, field) for field in fieldnames)
+                for subdomain in self.results["subdomains"]]
+
+        with open(filepath, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(rows)
 
         return filepath
 
 
+    @staticmethod
+    def _normalize_subdomains(subdomains: List[str]) -> List[str]:
+        """Drop duplicates (case-insensitive) while preserving discovery order"""
+        return list(dict.fromkeys(sub.strip().lower() for sub in subdomains if sub))
+
     def run_reconnaissance(self) -> Dict:
         try:
-            subdomains = self.run_amass(self.timeout)
+            validated = {}
+            if AMASS_PATH is not None:
+                # Let amass enumerate in the background while the common subdomains
+                # are validated, which also warms up the connection pool and DNS cache
+                with ThreadPoolExecutor(max_workers=1) as amass_executor:
+                    amass_future = amass_executor.submit(self.run_amass, self.timeout)
+                    warmup = self._normalize_subdomains(self.fallback_subdomain_enumeration())
+                    validated.update(zip(warmup, self.validate_subdomain(warmup, self.workers)))
+                    # Report amass's findings, plus any common subdomain it missed
+                    # that the warm-up showed to resolve
+                    resolved_warmup = [sub for sub in warmup if validated[sub].get("dns_active")]
+                    subdomains = self._normalize_subdomains(amass_future.result() + resolved_warmup)
+            else:
+                subdomains = self._normalize_subdomains(self.run_amass(self.timeout))
+
             if not subdomains:
                 err_msg = f"No subdomains found for {self.domain}"
                 self.results["errors"].append(err_msg)
@@ -231,7 +432,10 @@ class Reconnaissance:
             else:
                 self.results["total_subdomains"] = len(subdomains)
 
-                valid_results = self.validate_subdomain(subdomains, self.workers)
+                # Only validate what the warm-up batch has not already covered
+                pending = [sub for sub in subdomains if sub not in validated]
+                validated.update(zip(pending, self.validate_subdomain(pending, self.workers)))
+                valid_results = [validated[sub] for sub in subdomains]
                 self.results["subdomains"] = valid_results
 
                 active_results = [sub for sub in valid_results if sub.get("active")]
@@ -259,10 +463,34 @@ class Reconnaissance:
             return self.results
 
 
+def _init_worker_logging(level: int):
+    """Apply the parent's log level in a spawned worker, whose module-level setup defaults to INFO"""
+    logging.getLogger().setLevel(level)
+
+
+def _validate_chunk(domain: str, output_dir: str, subdomains: List[str], max_worker: int) -> List[Dict]:
+    """Validate one chunk of subdomains inside a worker process"""
+    recon = Reconnaissance(domain, output_dir, workers=max_worker)
+    try:
+        return recon._validate_threaded(subdomains, max_worker)
+    finally:
+        recon.session.close()
+
+
+def recon_many(domains: List[str], output_dir: str, timeout: int = 300, workers: int = 20) -> Iterator[Dict]:
+    """Run reconnaissance for each domain, sharing one HTTP session and DNS cache across the batch"""
+    session = create_session(workers)
+    try:
+        for domain in domains:
+            yield Reconnaissance(domain, output_dir, timeout, workers, session=session).run_reconnaissance()
+    finally:
+        session.close()
+
     
 def main():
     parser = argparse.ArgumentParser(description="Reconnaissance script for subdomains")
-    parser.add_argument('domain', help='Target domain for reconnaissance')
+    parser.add_argument('domains', nargs='+', metavar='domain',
+                       help='Target domain(s) for reconnaissance')
     parser.add_argument('--output-dir', '-o', default='output',
                        help='Output directory for results (default: output)')
     parser.add_argument('--json-only', action='store_true',
@@ -281,9 +509,8 @@ def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    recon = Reconnaissance(args.domain, args.output_dir, args.timeout, args.workers)
-
-    results = recon.run_reconnaissance()
+    for _ in recon_many(args.domains, args.output_dir, args.timeout, args.workers):
+        pass
 
 if __name__ == '__main__':
     sys.exit(main())